@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Entry point for ASGI servers, e.g. `uvicorn asgi:app`.
+
+The read-heavy endpoints (get_user, search_creatures, bite_treatments and
+GET /bug_bites/<id>) run as coroutines on an async SQLAlchemy engine
+(aiosqlite or asyncpg), so a request waiting on the database holds a pooled
+connection but no thread. Every other route, and every other method on those
+paths, is handed to the Flask app on a thread pool. Both halves share the
+response cache, so writes made through Flask still invalidate what the async
+views cached, and responses are rendered by the same JSON providers.
+
+Production launch, one event loop per worker process:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5555 --workers 4 \\
+        --backlog 4096 --limit-concurrency 4000 --timeout-keep-alive 5 --proxy-headers
+
+or `python asgi.py`, which reads the same settings from HOST, PORT,
+WEB_CONCURRENCY, ASGI_BACKLOG and ASGI_LIMIT_CONCURRENCY. Concurrent queries
+per worker are still capped by DB_POOL_SIZE + DB_MAX_OVERFLOW; requests beyond
+that wait up to DB_POOL_TIMEOUT for a connection without tying up a thread.
+"""
+
+# Standard library imports
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+
+# Remote library imports
+from a2wsgi import WSGIMiddleware
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+# Local imports
+import metrics
+from app import create_app
+from cache import SKIPPED_HEADERS, cache_key, response_etag
+from config import apply_sqlite_pragmas, db
+from models import BiteTreatment, BugBite, Creature, User
+from pagination import PaginationError, paginate_async, parse_count, parse_fields, parse_limit, page_headers
+from recommendations import recommend_treatments_query
+from schemas import BiteTreatmentSchema, BugBiteSchema, CreatureSchema, UserSchema
+from search import search_creatures_query
+from sqlstats import sql_stats
+from views import BUG_BITE_LOAD_OPTIONS
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def create_async_db_engine(flask_app):
+    """An async engine on the Flask app's database with the same pool settings."""
+    with flask_app.app_context():
+        url = db.engine.url
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for {backend}")
+    engine = create_async_engine(
+        url.set(drivername=ASYNC_DRIVERS[backend]), **flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    )
+    if backend == "sqlite":
+        event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+def json_response(flask_app, data, status=200, headers=None):
+    response = flask_app.json.response(data)
+    # what flask-cors adds to every Flask response with the default CORS() setup
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers.extend(headers or {})
+    return Response(response.get_data(), status, headers=dict(response.headers))
+
+
+def _if_none_match(request):
+    header = request.headers.get("if-none-match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def _conditional(request, response):
+    etag = f'"{response_etag(response.body)}"'
+    response.headers["ETag"] = etag
+    tags = _if_none_match(request)
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return response
+
+
+def async_view(endpoint, namespace):
+    """Run an async view inside a Flask app context, caching its 200 responses
+    in the Flask view's cache namespace and recording it on /metrics under the
+    Flask endpoint name."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request):
+            flask_app = request.app.state.flask_app
+            started = time.perf_counter()
+            with flask_app.app_context():
+                cache = flask_app.extensions["cache"]
+                key = cache_key(namespace, cache.generation(namespace),
+                                request.url.path, request.query_params.multi_items())
+                entry = cache.get(key)
+                if entry is not None:
+                    body, status, headers = entry
+                    response = Response(body, status, headers=dict(headers))
+                else:
+                    response = await view(request, flask_app)
+                    if response.status_code == 200:
+                        headers = [(name, value) for name, value in response.headers.items()
+                                   if name.title() not in SKIPPED_HEADERS]
+                        cache.set(key, (response.body, response.status_code, headers),
+                                  flask_app.config.get("CACHE_DEFAULT_TTL"))
+                if response.status_code == 200:
+                    response = _conditional(request, response)
+
+                statements, sql_seconds = sql_stats()
+                metrics.observe_request(
+                    endpoint, request.method, response.status_code, time.perf_counter() - started,
+                    statements, sql_seconds, g.get("serialize_time", 0.0),
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+@async_view("views.get_user", "get_user")
+async def get_user(request, flask_app):
+    async with request.app.state.sessions() as session:
+        user = await session.get(User, request.path_params["user_id"])
+
+    if user:
+        return json_response(flask_app, UserSchema().dump(user))
+    return json_response(flask_app, {"message": "User not found"}, 404)
+
+
+@async_view("views.search_creatures", "search_creatures")
+async def search_creatures(request, flask_app):
+    args = request.query_params
+    keywords = args.get('keywords', '').split(',')
+    match_all = args.get('match', 'any') == 'all'
+    prefix = args.get('prefix', 'true').lower() != 'false'
+    query, ordering = search_creatures_query(keywords, match_all=match_all, prefix=prefix)
+
+    try:
+        fields = parse_fields(args, CreatureSchema)
+        async with request.app.state.sessions() as session:
+            creatures, next_cursor, total = await paginate_async(
+                session, query, ordering, model=Creature, fields=fields,
+                limit=parse_limit(args), after=args.get('after'), with_count=parse_count(args))
+    except PaginationError as err:
+        return json_response(flask_app, {"message": str(err)}, 400)
+
+    creatures_data = CreatureSchema(many=True, only=fields).dump(creatures)
+    return json_response(flask_app, {"creatures": creatures_data}, 200, page_headers(next_cursor, total))
+
+
+@async_view("views.get_bite_treatments_by_descriptions", "bite_treatments")
+async def get_bite_treatments_by_descriptions(request, flask_app):
+    args = request.query_params
+    query, ordering = recommend_treatments_query(args.get('bite_description'), args.get('creature_description'))
+
+    try:
+        fields = parse_fields(args, BiteTreatmentSchema)
+        async with request.app.state.sessions() as session:
+            bite_treatments, next_cursor, total = await paginate_async(
+                session, query, ordering, model=BiteTreatment, fields=fields,
+                limit=parse_limit(args), after=args.get('after'), with_count=parse_count(args))
+    except PaginationError as err:
+        return json_response(flask_app, {"message": str(err)}, 400)
+
+    result = BiteTreatmentSchema(many=True, only=fields).dump(bite_treatments)
+    return json_response(flask_app, result, 200, page_headers(next_cursor, total))
+
+
+@async_view("views.bugbiteresource", "bug_bites")
+async def get_bug_bite(request, flask_app):
+    async with request.app.state.sessions() as session:
+        bug_bite = await session.get(BugBite, request.path_params["bug_bite_id"], options=BUG_BITE_LOAD_OPTIONS)
+
+    if bug_bite:
+        return json_response(flask_app, BugBiteSchema().dump(bug_bite))
+    return json_response(flask_app, {"message": "BugBite not found"}, 404)
+
+
+def create_asgi_app(flask_app=None):
+    flask_app = flask_app or create_app()
+    engine = create_async_db_engine(flask_app)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    # other methods on these paths, and CORS preflights, fall through to Flask
+    routes = [
+        Route("/get_user/{user_id:int}", get_user, methods=["GET"]),
+        Route("/search_creatures", search_creatures, methods=["GET"]),
+        Route("/bite_treatments", get_bite_treatments_by_descriptions, methods=["GET"]),
+        Route("/bug_bites/{bug_bite_id:int}", get_bug_bite, methods=["GET"]),
+        Mount("", WSGIMiddleware(flask_app, workers=flask_app.config.get("WSGI_FALLBACK_THREADS", 10))),
+    ]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.flask_app = flask_app
+    app.state.sessions = async_sessionmaker(engine, expire_on_commit=False)
+    return app
+
+
+app = create_asgi_app()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(
+        "asgi:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 5555)),
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        backlog=int(os.getenv("ASGI_BACKLOG", 4096)),
+        limit_concurrency=int(os.getenv("ASGI_LIMIT_CONCURRENCY", 4000)),
+        timeout_keep_alive=5,
+        proxy_headers=True,
+    )
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Login throughput and cheap-read latency under concurrent auth load.
+
+Logins hammer /login from several threads while a probe thread measures
+/search_creatures, showing whether hashing starves unrelated requests:
+
+    python benchmarks/auth_load.py --login-threads 16 --duration 10
+    python benchmarks/auth_load.py --hash-workers 1 --hash-queue 2
+"""
+
+# Standard library imports
+import argparse
+import contextlib
+import io
+import threading
+import time
+from collections import Counter
+
+# Local imports
+from common import connect, latency_summary, serve, temporary_app, timed_request, write_results
+from config import db
+
+
+def seed_users(app, count, password):
+    from models import User
+    from seed import seed
+
+    with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        seed(users=count, creatures=1000, treatments=0, bites=0, password=password)
+        return [email for (email,) in db.session.query(User.email)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--hash-method", default="scrypt")
+    parser.add_argument("--hash-workers", type=int, default=None)
+    parser.add_argument("--hash-queue", type=int, default=None)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    settings = {"PASSWORD_HASH_METHOD": args.hash_method}
+    if args.hash_workers:
+        settings["PASSWORD_HASH_WORKERS"] = args.hash_workers
+    if args.hash_queue is not None:
+        settings["PASSWORD_HASH_QUEUE"] = args.hash_queue
+
+    password = "password123"
+    with temporary_app(**settings) as app:
+        emails = seed_users(app, args.users, password)
+        deadline = None
+        login_statuses = Counter()
+        login_latencies = []
+        probe_latencies = []
+        lock = threading.Lock()
+
+        def login_worker(address, offset):
+            connection = connect(address)
+            i = offset
+            while time.perf_counter() < deadline:
+                body = {"email": emails[i % len(emails)], "password": password}
+                status, elapsed = timed_request(connection, "POST", "/login", body)
+                with lock:
+                    login_statuses[status] += 1
+                    if status == 200:
+                        login_latencies.append(elapsed)
+                i += 1
+
+        def probe_worker(address):
+            connection = connect(address)
+            while time.perf_counter() < deadline:
+                status, elapsed = timed_request(connection, "GET", "/search_creatures?keywords=the&limit=10")
+                probe_latencies.append(elapsed)
+
+        with serve(app) as address:
+            deadline = time.perf_counter() + args.duration
+            threads = [threading.Thread(target=login_worker, args=(address, i)) for i in range(args.login_threads)]
+            threads.append(threading.Thread(target=probe_worker, args=(address,)))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    write_results({
+        "benchmark": "auth_load",
+        "settings": vars(args),
+        "login": {
+            "per_second": login_statuses[200] / args.duration,
+            "statuses": dict(login_statuses),
+            "latency": latency_summary(login_latencies),
+        },
+        "search_creatures_latency": latency_summary(probe_latencies),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+
+# Standard library imports
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.client import HTTPConnection
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+# Remote library imports
+from flask_migrate import upgrade
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+# Local imports
+from app import create_app
+from config import Config, db
+
+
+@contextmanager
+def temporary_app(**settings):
+    """An app bound to a fresh SQLite file, migrated to the latest revision."""
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        attributes = {
+            "SQLALCHEMY_DATABASE_URI": uri,
+            "SECRET_KEY": "benchmark",
+            "CACHE_BACKEND": "none",
+        }
+        attributes.update(settings)
+        app = create_app(type("BenchmarkConfig", (Config,), attributes))
+        with app.app_context(), contextlib.redirect_stderr(io.StringIO()):
+            upgrade(directory=os.path.join(SERVER_DIR, "migrations"))
+        yield app
+        with app.app_context():
+            db.engine.dispose()
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextmanager
+def serve(app):
+    """Run the app on a local threaded WSGI server, yield (host, port)."""
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.host, server.port
+    finally:
+        server.shutdown()
+
+
+def timed_request(connection, method, path, body=None, headers=None):
+    """Send one request on a keep-alive connection, return (status, seconds)."""
+    headers = dict(headers or {})
+    if body is not None:
+        body = json.dumps(body)
+        headers["Content-Type"] = "application/json"
+    started = time.perf_counter()
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    return response.status, time.perf_counter() - started
+
+
+def connect(address):
+    return HTTPConnection(*address, timeout=60)
+
+
+def latency_summary(samples):
+    """Count and p50/p95/p99/max in milliseconds for a list of seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(results, output=None):
+    """Print results as JSON and optionally save them for compare.py."""
+    results = dict(results, environment=environment())
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Compare two benchmark result files, e.g. from two commits.
+
+    python benchmarks/compare.py results/before.json results/after.json
+"""
+
+# Standard library imports
+import argparse
+import json
+
+
+def flatten(results, prefix=""):
+    values = {}
+    for key, value in results.items():
+        if key in ("environment", "settings"):
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="Only show changes larger than this many percent")
+    args = parser.parse_args()
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+    print(f"{before['environment'].get('commit')} -> {after['environment'].get('commit')}")
+
+    old, new = flatten(before), flatten(after)
+    for name in sorted(old.keys() & new.keys()):
+        change = (new[name] - old[name]) / old[name] * 100 if old[name] else 0.0
+        if abs(change) >= args.threshold:
+            print(f"{name:60} {old[name]:14.3f} {new[name]:14.3f} {change:+8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""HTTP load test for every API route against a freshly seeded database.
+
+Seeds a temporary SQLite database, serves the app on a local threaded
+server and drives each scenario from several keep-alive clients:
+
+    python benchmarks/load.py --bites 100000 --threads 8 --duration 10
+    python benchmarks/load.py --scenario search_creatures --cache --output results/search.json
+"""
+
+# Standard library imports
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+from collections import Counter
+
+# Local imports
+from common import connect, latency_summary, serve, temporary_app, timed_request, write_results
+from config import db
+
+PASSWORD = "password123"
+KEYWORDS = ["red", "swollen", "itchy", "ant", "spider", "bite", "pain", "rash", "tick", "bee"]
+
+
+def seed_database(app, args):
+    from models import BugBite, User
+    from seed import seed
+
+    with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        seed(users=args.users, creatures=args.creatures, treatments=args.treatments,
+             bites=args.bites, password=PASSWORD)
+        emails = [email for (email,) in db.session.query(User.email)]
+        bug_bite_ids = [bug_bite_id for (bug_bite_id,) in db.session.query(BugBite.id)]
+    return emails, bug_bite_ids
+
+
+def scenarios(emails, bug_bite_ids):
+    """name -> function returning the next (method, path, body)."""
+    # deletes consume ids, every other scenario only reads or rewrites rows
+    deletable = list(bug_bite_ids)
+    random.shuffle(deletable)
+    lock = threading.Lock()
+
+    def delete_request():
+        with lock:
+            bug_bite_id = deletable.pop() if deletable else 0
+        return "DELETE", f"/bug_bites/{bug_bite_id}", None
+
+    return {
+        "login": lambda: ("POST", "/login", {"email": random.choice(emails), "password": PASSWORD}),
+        "search_creatures": lambda: ("GET", f"/search_creatures?keywords={random.choice(KEYWORDS)}", None),
+        "bite_treatments": lambda: (
+            "GET", f"/bite_treatments?bite_description={random.choice(KEYWORDS)}"
+                   f"&creature_description={random.choice(KEYWORDS)}", None),
+        "bug_bite_get": lambda: ("GET", f"/bug_bites/{random.choice(bug_bite_ids)}", None),
+        "bug_bite_put": lambda: (
+            "PUT", f"/bug_bites/{random.choice(bug_bite_ids)}",
+            {"bite_description": f"Updated bite {random.random()}", "treatment_plan_id": 1}),
+        "bug_bite_create": lambda: (
+            "POST", "/bug_bites/bulk",
+            [{"bite_description": "A new swollen bite", "treatment_plan_id": 1}]),
+        "bug_bite_delete": delete_request,
+    }
+
+
+def run_scenario(address, next_request, threads, duration):
+    statuses = Counter()
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        connection = connect(address)
+        while time.perf_counter() < deadline:
+            method, path, body = next_request()
+            status, elapsed = timed_request(connection, method, path, body)
+            with lock:
+                statuses[status] += 1
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "latency": latency_summary(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--creatures", type=int, default=1000)
+    parser.add_argument("--treatments", type=int, default=25)
+    parser.add_argument("--bites", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    parser.add_argument("--scenario", action="append", help="Run only these scenarios (repeatable)")
+    parser.add_argument("--cache", action="store_true", help="Enable the in-memory response cache")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for request generation")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    settings = {"CACHE_BACKEND": "memory" if args.cache else "none"}
+    results = {}
+    with temporary_app(**settings) as app:
+        emails, bug_bite_ids = seed_database(app, args)
+        available = scenarios(emails, bug_bite_ids)
+        unknown = set(args.scenario or []) - set(available)
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        with serve(app) as address:
+            for name, next_request in available.items():
+                if args.scenario and name not in args.scenario:
+                    continue
+                results[name] = run_scenario(address, next_request, args.threads, args.duration)
+
+    write_results({"benchmark": "load", "settings": vars(args), "scenarios": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for dumping and loading the marshmallow schemas.
+
+    python benchmarks/schemas.py --objects 1000 --repeat 20 --output results/schemas.json
+"""
+
+# Standard library imports
+import argparse
+import timeit
+
+# Local imports
+from common import write_results
+from models import BugBite, Creature, User
+from schemas import BugBiteSchema, CreatureSchema, UserSchema
+
+
+def build_objects(count):
+    creatures = [
+        Creature(id=i, bug_name="Spider", image=f"https://example.com/{i}.jpg",
+                 bug_description="A small brown spider with long legs")
+        for i in range(count)
+    ]
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", password="x" * 100) for i in range(count)]
+    for i, user in enumerate(users):
+        user.id = i
+    bug_bites = [
+        BugBite(id=i, bite_description="Two small red puncture marks", symptoms="Swelling and pain",
+                severity_of_bite="Moderate", treatment_plan_id=1)
+        for i in range(count)
+    ]
+    for i, bug_bite in enumerate(bug_bites):
+        bug_bite.creatures = creatures[i:i + 2]
+    return {"user": users, "creature": creatures, "bug_bite": bug_bites}
+
+
+def payloads(objects):
+    return {
+        "user": [{"username": u.username, "email": u.email, "password": "password123"} for u in objects["user"]],
+        "creature": [{"bug_name": c.bug_name, "image": c.image, "bug_description": c.bug_description}
+                     for c in objects["creature"]],
+        "bug_bite": [{"bite_description": b.bite_description, "symptoms": b.symptoms,
+                      "severity_of_bite": b.severity_of_bite, "treatment_plan_id": 1}
+                     for b in objects["bug_bite"]],
+    }
+
+
+def measure(function, count, repeat):
+    # best of repeat runs, reported per object
+    best = min(timeit.repeat(function, number=1, repeat=repeat))
+    return {"objects_per_second": count / best, "us_per_object": best / count * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    objects = build_objects(args.objects)
+    data = payloads(objects)
+    schemas = {"user": UserSchema, "creature": CreatureSchema, "bug_bite": BugBiteSchema}
+
+    results = {}
+    for name, schema_class in schemas.items():
+        results[f"{name}_dump"] = measure(lambda: schema_class(many=True).dump(objects[name]), args.objects, args.repeat)
+        results[f"{name}_load"] = measure(lambda: schema_class(many=True).load(data[name]), args.objects, args.repeat)
+
+    write_results({"benchmark": "schemas", "settings": vars(args), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Measure per-worker import and boot cost of the app factory.
+
+Each run is a fresh interpreter, like a newly forked worker that did not
+preload the app:
+
+    python benchmarks/startup.py --runs 20
+"""
+
+# Standard library imports
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+app.test_client().get('/')
+served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (served - created) * 1000,
+}))
+"""
+
+
+def run_probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=SERVER_DIR, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    report = {
+        key: {
+            "median": statistics.median(sample[key] for sample in samples),
+            "max": max(sample[key] for sample in samples),
+        }
+        for key in samples[0]
+    }
+    print(json.dumps({"runs": args.runs, "results_ms": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
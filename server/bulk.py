@@ -0,0 +1,51 @@
+from itertools import islice
+
+from sqlalchemy import insert
+
+from config import db
+from models import biter
+
+CHUNK_SIZE = 1000
+MAX_BULK_ROWS = 10000
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_insert_table(table, rows, chunk_size=CHUNK_SIZE):
+    """Insert row dicts with one executemany and one commit per chunk."""
+    count = 0
+    for chunk in chunked(rows, chunk_size):
+        db.session.execute(insert(table), chunk)
+        db.session.commit()
+        count += len(chunk)
+    return count
+
+
+def bulk_insert(model, rows, chunk_size=CHUNK_SIZE, return_ids=False):
+    """Bulk insert row dicts for a model, chunk by chunk.
+
+    Bypasses the ORM unit of work, so model @validates hooks and events do not
+    run; validate the rows before calling this. Returns the new ids in input
+    order when return_ids is set, otherwise the number of rows inserted.
+    """
+    if not return_ids:
+        return bulk_insert_table(model.__table__, rows, chunk_size)
+
+    ids = []
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    for chunk in chunked(rows, chunk_size):
+        ids.extend(db.session.scalars(stmt, chunk).all())
+        db.session.commit()
+    return ids
+
+
+def bulk_link_creatures(links, chunk_size=CHUNK_SIZE):
+    # links are {"creature_id": ..., "bug_bite_id": ...} dicts for the biter table
+    return bulk_insert_table(biter, links, chunk_size)
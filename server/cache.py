@@ -0,0 +1,210 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+# model class -> names of the cached views whose output depends on it
+_dependents = {}
+_listening = set()
+
+SKIPPED_HEADERS = {"Content-Length", "Set-Cookie"}
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # generations live outside the LRU so eviction can't resurrect stale entries
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache on a Redis-compatible server, shared by every worker."""
+
+    def __init__(self, url, prefix="whobitme:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def generation(self, namespace):
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace):
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def generation(self, namespace):
+        return 0
+
+    def bump(self, namespace):
+        pass
+
+    def clear(self):
+        pass
+
+
+def get_cache():
+    return current_app.extensions["cache"]
+
+
+def invalidate(*namespaces):
+    # bumping a namespace's generation orphans all of its entries at once
+    cache = get_cache()
+    for namespace in namespaces:
+        cache.bump(namespace)
+
+
+def invalidate_models(*models):
+    namespaces = set()
+    for model in models:
+        namespaces.update(_dependents.get(model, ()))
+    if namespaces:
+        invalidate(*namespaces)
+
+
+def cache_key(namespace, generation, path, args):
+    """Key for a cached view response; args are (name, value) query pairs."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(args))
+    return f"view:{namespace}:{generation}:{path}?{query}"
+
+
+def response_etag(body):
+    return hashlib.sha1(body).hexdigest()
+
+
+def _conditional(response):
+    response.set_etag(response_etag(response.get_data()))
+    return response.make_conditional(request)
+
+
+def cached(namespace, depends_on, ttl=None):
+    """Cache a GET view's 200 responses keyed on path and query string.
+
+    Entries are dropped when rows of any model in depends_on are inserted,
+    updated or deleted, and responses carry an ETag so clients sending
+    If-None-Match get a 304 without a body.
+    """
+    for model in depends_on:
+        _dependents.setdefault(model, set()).add(namespace)
+        _listen(model)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            key = cache_key(namespace, cache.generation(namespace), request.path, request.args.items(multi=True))
+            entry = cache.get(key)
+            if entry is not None:
+                body, status, headers = entry
+                response = current_app.response_class(body, status=status, headers=headers)
+                return _conditional(response)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            headers = [(name, value) for name, value in response.headers if name not in SKIPPED_HEADERS]
+            cache.set(key, (response.get_data(), response.status_code, headers),
+                      ttl or current_app.config.get("CACHE_DEFAULT_TTL"))
+            return _conditional(response)
+        return wrapper
+    return decorator
+
+
+def _mark_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("cache_dirty_models", set()).add(mapper.class_)
+
+
+def _listen(model):
+    if model in _listening:
+        return
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, name, _mark_dirty)
+    _listening.add(model)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    models = session.info.pop("cache_dirty_models", None)
+    if models and has_app_context() and "cache" in current_app.extensions:
+        invalidate_models(*models)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("cache_dirty_models", None)
+
+
+def init_app(app):
+    app.config.setdefault("CACHE_BACKEND", "memory")
+    app.config.setdefault("CACHE_DEFAULT_TTL", 60)
+    app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+
+    backend = app.config["CACHE_BACKEND"]
+    if backend == "redis":
+        cache = RedisCache(app.config["CACHE_REDIS_URL"])
+    elif backend == "memory":
+        cache = LRUCache(app.config["CACHE_MAX_ENTRIES"])
+    else:
+        cache = NullCache()
+    app.extensions["cache"] = cache
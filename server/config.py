@@ -1,36 +1,101 @@
+
 # Standard library imports
 import os
+import sqlite3
 # Remote library imports
 from dotenv import load_dotenv
-from flask import Flask
 from flask_cors import CORS
+from flask_login import LoginManager
 from flask_migrate import Migrate
-from flask_restful import Api
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import Engine
 
 load_dotenv()
 
 
-# Local imports
+def database_uri():
+    uri = os.getenv("DATABASE_URL", "sqlite:///app.db")
+    # Heroku-style URLs use the scheme SQLAlchemy dropped in 1.4
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def engine_options(uri):
+    # in-memory SQLite uses a single-connection pool that takes no sizing options
+    if uri in ("sqlite://", "sqlite:///:memory:"):
+        return {}
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
+    if uri.startswith("sqlite"):
+        # wait for a competing writer instead of failing with "database is locked"
+        options["connect_args"] = {"timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 15))}
+    return options
+
+
+class Config:
+    SECRET_KEY = os.getenv("SECRET_KEY")
+    SQLALCHEMY_DATABASE_URI = database_uri()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # fail or log requests that issue more SQL statements than this (N+1 guard)
+    SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", 0)) or None
+    SQL_QUERY_BUDGET_STRICT = os.getenv("SQL_QUERY_BUDGET_STRICT", "").lower() in ("1", "true")
+    # read endpoint cache: memory (default), redis or none
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # werkzeug hash method, e.g. "scrypt" or "pbkdf2:sha256:600000"; stored
+    # hashes made with another method are upgraded on the next login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 4 * PASSWORD_HASH_WORKERS))
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    # threads serving the Flask routes when running under asgi.py
+    WSGI_FALLBACK_THREADS = int(os.getenv("WSGI_FALLBACK_THREADS", 16))
+    # allow ?__profile=1 / X-Profile: 1 to return a cProfile report instead of the response
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true")
+
+
+# SQLite tuning applied to every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024)),
+    "temp_store": "MEMORY",
+}
 
-# Instantiate app, set attributes
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv("SECRET_KEY")
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.json.compact = False
 
-# Define metadata, instantiate db
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # aiosqlite connections are not sqlite3.Connection, asgi.py sets theirs
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_pragmas(dbapi_connection)
+
+
+# Local imports
+
+# Define metadata, instantiate extensions; create_app() in app.py binds them
 metadata = MetaData(naming_convention={
+    "ix": "ix_%(column_0_label)s",
     "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
 })
 db = SQLAlchemy(metadata=metadata)
-migrate = Migrate(app, db)
-db.init_app(app)
-
-# Instantiate REST API
-api = Api(app)
+migrate = Migrate()
+cors = CORS()
 
-# Instantiate CORS
-CORS(app)
\ No newline at end of file
+login_manager = LoginManager()
+login_manager.login_view = 'views.login'
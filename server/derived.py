@@ -0,0 +1,104 @@
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import BugBite, Creature, biter
+
+# Derived tables computed from bug bites (and the creatures linked to them).
+# Each handler exposes apply(connection, bite_ids, sign): it reads those bites
+# as they are in the database and adds (sign=1) or removes (sign=-1) their
+# contribution. Flushes remove the old contribution of every touched bite
+# before the flush and add the new one after it, inside the same transaction.
+_handlers = []
+
+CHUNK_SIZE = 500
+
+
+def register(handler):
+    _handlers.append(handler)
+    return handler
+
+
+def chunks(ids, size=CHUNK_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def upsert(connection, table, rows, key_columns, value_column):
+    """Add each row's value_column to the stored value, inserting missing keys."""
+    dialect = connection.dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={value_column: table.c[value_column] + stmt.excluded[value_column]},
+    )
+    for chunk in chunks(rows):
+        connection.execute(stmt, chunk)
+
+
+def apply(connection, bite_ids, sign):
+    if not bite_ids:
+        return
+    for handler in _handlers:
+        handler.apply(connection, bite_ids, sign)
+
+
+def refresh(connection, bite_ids):
+    # for rows written outside the unit of work, e.g. bulk inserts
+    apply(connection, set(bite_ids), 1)
+
+
+def rebuild(connection, batch_size=5000):
+    for handler in _handlers:
+        handler.clear(connection)
+    last_id = 0
+    while True:
+        ids = connection.execute(
+            select(BugBite.id).where(BugBite.id > last_id).order_by(BugBite.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return
+        apply(connection, ids, 1)
+        last_id = ids[-1]
+
+
+def _linked_bite_ids(connection, creature_ids):
+    bite_ids = set()
+    for chunk in chunks(creature_ids):
+        bite_ids.update(connection.execute(
+            select(biter.c.bug_bite_id).where(biter.c.creature_id.in_(chunk))
+        ).scalars())
+    return bite_ids
+
+
+def _touched(session, objects):
+    objects = [obj for obj in objects if isinstance(obj, (BugBite, Creature)) and obj.id is not None]
+    if not objects:
+        return set()
+    bite_ids = {obj.id for obj in objects if isinstance(obj, BugBite)}
+    creature_ids = [obj.id for obj in objects if isinstance(obj, Creature)]
+    return bite_ids | _linked_bite_ids(session.connection(), creature_ids)
+
+
+@event.listens_for(Session, "before_flush")
+def _remove_old_contributions(session, flush_context, instances):
+    if not _handlers:
+        return
+    bite_ids = _touched(session, list(session.dirty) + list(session.deleted))
+    session.info["derived_bite_ids"] = bite_ids
+    if bite_ids:
+        apply(session.connection(), bite_ids, -1)
+
+
+@event.listens_for(Session, "after_flush")
+def _add_new_contributions(session, flush_context):
+    if not _handlers:
+        return
+    # every bite whose old contribution was removed gets its new one, plus the
+    # bites that did not exist before this flush (session.new keeps its
+    # pre-flush contents here, now with primary keys)
+    bite_ids = session.info.pop("derived_bite_ids", set()) | _touched(session, session.new)
+    if bite_ids:
+        apply(session.connection(), bite_ids, 1)
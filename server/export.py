@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from config import db
+from models import BugBite
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = [
+    "id", "bite_description", "symptoms", "severity_of_bite", "user_id",
+    "treatment_plan_id", "treatment_plan", "creature_ids", "creature_names",
+]
+
+
+def iter_bug_bites(batch_size=1000):
+    # server-side cursor: rows come back batch_size at a time and relationships
+    # are loaded with one IN query per batch, so memory stays flat
+    stmt = (
+        select(BugBite)
+        .options(selectinload(BugBite.creatures), selectinload(BugBite.treatment_plan))
+        .order_by(BugBite.id)
+        .execution_options(yield_per=batch_size, stream_results=True)
+    )
+    yield from db.session.scalars(stmt)
+
+
+def bug_bite_record(bug_bite):
+    return {
+        "id": bug_bite.id,
+        "bite_description": bug_bite.bite_description,
+        "symptoms": bug_bite.symptoms,
+        "severity_of_bite": bug_bite.severity_of_bite,
+        "user_id": bug_bite.user_id,
+        "treatment_plan_id": bug_bite.treatment_plan_id,
+        "treatment_plan": bug_bite.treatment_plan.treatment_plan if bug_bite.treatment_plan else None,
+        "creatures": [
+            {"id": creature.id, "bug_name": creature.bug_name} for creature in bug_bite.creatures
+        ],
+    }
+
+
+def _ndjson_chunks(records, batch_size):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record))
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(records, batch_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for i, record in enumerate(records, start=1):
+        creatures = record["creatures"]
+        record["creature_ids"] = ";".join(str(creature["id"]) for creature in creatures)
+        record["creature_names"] = ";".join(creature["bug_name"] for creature in creatures)
+        writer.writerow(record)
+        if i % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_bug_bites(export_format="ndjson", batch_size=1000):
+    """Yield the bug_bites export as text chunks of batch_size rows."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    records = (bug_bite_record(bug_bite) for bug_bite in iter_bug_bites(batch_size))
+    if export_format == "csv":
+        return _csv_chunks(records, batch_size)
+    return _ndjson_chunks(records, batch_size)
@@ -0,0 +1,132 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, request
+
+import passwords
+from sqlstats import sql_stats
+
+# Per-process metrics in Prometheus text format. With several workers each one
+# reports its own numbers; scrape them individually or sum in Prometheus.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+# (endpoint, method, status) -> [bucket counts..., +Inf count], and the sum
+_latency_buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+_latency_sum = defaultdict(float)
+# endpoint -> totals
+_sql_statements = defaultdict(int)
+_sql_seconds = defaultdict(float)
+_serialize_seconds = defaultdict(float)
+
+# values other modules report through, name -> (help, type, callable)
+_gauges = {}
+
+
+def gauge(name, help_text, read, kind="gauge"):
+    _gauges[name] = (help_text, kind, read)
+
+
+def observe_request(endpoint, method, status, elapsed, statements, sql_seconds, serialize_seconds):
+    key = (endpoint, method, str(status))
+    with _lock:
+        buckets = _latency_buckets[key]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                buckets[i] += 1
+        buckets[-1] += 1
+        _latency_sum[key] += elapsed
+        _sql_statements[endpoint] += statements
+        _sql_seconds[endpoint] += sql_seconds
+        _serialize_seconds[endpoint] += serialize_seconds
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def render():
+    lines = [
+        "# HELP whobitme_request_duration_seconds Request latency by endpoint.",
+        "# TYPE whobitme_request_duration_seconds histogram",
+    ]
+    with _lock:
+        for (endpoint, method, status), buckets in sorted(_latency_buckets.items()):
+            labels = dict(endpoint=endpoint, method=method, status=status)
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f"whobitme_request_duration_seconds_bucket{_labels(**labels, le=bound)} {count}")
+            lines.append(f"whobitme_request_duration_seconds_bucket{_labels(**labels, le='+Inf')} {buckets[-1]}")
+            lines.append(f"whobitme_request_duration_seconds_sum{_labels(**labels)} {_latency_sum[(endpoint, method, status)]}")
+            lines.append(f"whobitme_request_duration_seconds_count{_labels(**labels)} {buckets[-1]}")
+
+        for name, help_text, values in (
+            ("whobitme_sql_statements_total", "SQL statements executed by endpoint.", _sql_statements),
+            ("whobitme_sql_seconds_total", "Time spent executing SQL by endpoint.", _sql_seconds),
+            ("whobitme_serialization_seconds_total", "Time spent dumping schemas by endpoint.", _serialize_seconds),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{_labels(endpoint=endpoint)} {value}" for endpoint, value in sorted(values.items())]
+
+    for name, (help_text, kind, read) in sorted(_gauges.items()):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {read()}"]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    return current_app.response_class(render(), mimetype="text/plain; version=0.0.4")
+
+
+def _profile_requested():
+    if not current_app.config.get("PROFILING_ENABLED"):
+        return False
+    return request.args.get("__profile") == "1" or request.headers.get("X-Profile") == "1"
+
+
+def _before_request():
+    g.request_started = time.perf_counter()
+    if _profile_requested():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # only one profiler can run per process, serve this one unprofiled
+            return
+        g.profiler = profiler
+
+
+def _after_request(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(40)
+        return current_app.response_class(report.getvalue(), mimetype="text/plain")
+
+    started = g.get("request_started")
+    if started is not None:
+        statements, sql_seconds = sql_stats()
+        observe_request(
+            request.endpoint or "unmatched", request.method, response.status_code,
+            time.perf_counter() - started, statements, sql_seconds, g.get("serialize_time", 0.0),
+        )
+    return response
+
+
+def init_app(app):
+    """Record request metrics, serve them on /metrics and allow per-request
+    profiling with ?__profile=1 or an X-Profile: 1 header when
+    PROFILING_ENABLED is set."""
+    app.config.setdefault("PROFILING_ENABLED", False)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+    gauge("whobitme_password_hash_in_flight", "Password hashes running or queued.",
+          lambda: passwords.stats()["in_flight"])
+    gauge("whobitme_password_hash_rejected_total", "Password operations turned away.",
+          lambda: passwords.stats()["rejected"], kind="counter")
@@ -0,0 +1,64 @@
+"""Add creatures_fts full-text index
+
+Revision ID: 3f9a1c7d2b64
+Revises: cff3fbb6ed6a
+Create Date: 2026-10-18 15:02:11.412087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7d2b64'
+down_revision = 'cff3fbb6ed6a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only, other databases fall back to a substring search
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE creatures_fts USING fts5(
+            bug_description,
+            content='creatures',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER creatures_fts_ai AFTER INSERT ON creatures BEGIN
+            INSERT INTO creatures_fts(rowid, bug_description)
+            VALUES (new.id, new.bug_description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER creatures_fts_ad AFTER DELETE ON creatures BEGIN
+            INSERT INTO creatures_fts(creatures_fts, rowid, bug_description)
+            VALUES ('delete', old.id, old.bug_description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER creatures_fts_au AFTER UPDATE OF bug_description ON creatures BEGIN
+            INSERT INTO creatures_fts(creatures_fts, rowid, bug_description)
+            VALUES ('delete', old.id, old.bug_description);
+            INSERT INTO creatures_fts(rowid, bug_description)
+            VALUES (new.id, new.bug_description);
+        END
+    """)
+    # index the rows that already exist
+    op.execute("INSERT INTO creatures_fts(creatures_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS creatures_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS creatures_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS creatures_fts_ai")
+    op.execute("DROP TABLE IF EXISTS creatures_fts")
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.associationproxy import association_proxy
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, func
 from sqlalchemy.orm import validates
 from flask_login import UserMixin
 
@@ -10,7 +10,9 @@ biter = db.Table(
     "biter",
     db.Column("creature_id", db.Integer, db.ForeignKey("creatures.id")),
     db.Column("bug_bite_id", db.Integer, db.ForeignKey("bug_bites.id")),
-    db.PrimaryKeyConstraint("creature_id", "bug_bite_id")
+    db.PrimaryKeyConstraint("creature_id", "bug_bite_id"),
+    # the primary key only serves creature -> bites, this serves bite -> creatures
+    db.Index("ix_biter_bug_bite_id_creature_id", "bug_bite_id", "creature_id"),
     )
 
 class User(db.Model, UserMixin):
@@ -19,6 +21,10 @@ class User(db.Model, UserMixin):
     username = db.Column(db.String, unique=True, nullable=False)
     email = db.Column(db.String, unique=True, nullable=False)
     password = db.Column(db.String, nullable=False)
+    # login and sign-up look emails up case-insensitively
+    __table_args__ = (
+        db.Index("ix_users_email_lower", func.lower(email)),
+    )
 
     @validates("email")
     def validate_email(self, key, email):
@@ -66,7 +72,7 @@ class BugBite(db.Model):
     ) 
     symptoms = db.Column(db.String)
     severity_of_bite = db.Column(db.String)
-    treatment_plan_id = db.Column(db.Integer, db.ForeignKey("bite_treatments.id"))
+    treatment_plan_id = db.Column(db.Integer, db.ForeignKey("bite_treatments.id"), index=True)
     
     # validate description length
     @validates("bite_description")
@@ -76,7 +82,7 @@ class BugBite(db.Model):
         return bite_description
     
     #many-to-one with user
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), index=True)
     user = db.relationship("User", back_populates="bug_bites")
    
 
@@ -88,3 +94,9 @@ class BugBite(db.Model):
 
 
 
+# keyword -> treatment weights derived from bug bites, see recommendations.py
+class TreatmentRecommendation(db.Model):
+    __tablename__ = "treatment_recommendations"
+    keyword = db.Column(db.String, primary_key=True)
+    treatment_id = db.Column(db.Integer, db.ForeignKey("bite_treatments.id"), primary_key=True)
+    weight = db.Column(db.Integer, nullable=False, default=0)
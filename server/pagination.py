@@ -0,0 +1,127 @@
+import base64
+import json
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import load_only
+
+from config import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+    if not isinstance(values, list):
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def parse_limit(args):
+    try:
+        limit = int(args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, MAX_LIMIT)
+
+
+def parse_fields(args, schema_class):
+    # fields=id,bug_name -> only those schema fields, None means all of them
+    fields = args.get("fields")
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in schema_class._declared_fields]
+    if unknown:
+        raise PaginationError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def parse_count(args):
+    return args.get("count", "true").lower() != "false"
+
+
+def _after_condition(ordering, values):
+    # keyset condition for "row comes after values" with mixed asc/desc columns
+    if len(values) != len(ordering):
+        raise PaginationError("Invalid cursor")
+    conditions = []
+    for i, (column, descending) in enumerate(ordering):
+        equal = [ordering[j][0] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*equal, beyond))
+    return or_(*conditions)
+
+
+def page_statements(stmt, ordering, model=None, fields=None, limit=DEFAULT_LIMIT, after=None):
+    """(count statement, page statement) for a keyset-paginated select().
+
+    ordering is a list of (column, descending) pairs that must end in a unique
+    column. With model and fields given only those columns are loaded.
+    """
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+
+    if model is not None and fields:
+        columns = [getattr(model, name) for name in fields if name in model.__table__.columns]
+        stmt = stmt.options(load_only(*columns))
+
+    keys = [column.label(f"_key_{i}") for i, (column, descending) in enumerate(ordering)]
+    stmt = stmt.add_columns(*keys).order_by(None).order_by(
+        *[column.desc() if descending else column.asc() for column, descending in ordering]
+    )
+    if after:
+        stmt = stmt.where(_after_condition(ordering, decode_cursor(after)))
+    return count_stmt, stmt.limit(limit + 1)
+
+
+def page_result(rows, limit):
+    """(items, next_cursor) from the rows of a page statement."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1:])
+    return [row[0] for row in rows], next_cursor
+
+
+def paginate(stmt, ordering, model=None, fields=None, limit=DEFAULT_LIMIT, after=None, with_count=True):
+    """Run a keyset-paginated select() on db.session.
+
+    Returns (items, next_cursor, total); total is None when with_count is off.
+    """
+    count_stmt, page_stmt = page_statements(stmt, ordering, model, fields, limit, after)
+    total = db.session.scalar(count_stmt) if with_count else None
+    items, next_cursor = page_result(db.session.execute(page_stmt).all(), limit)
+    return items, next_cursor, total
+
+
+async def paginate_async(session, stmt, ordering, model=None, fields=None, limit=DEFAULT_LIMIT, after=None,
+                         with_count=True):
+    """paginate() on an AsyncSession."""
+    count_stmt, page_stmt = page_statements(stmt, ordering, model, fields, limit, after)
+    total = await session.scalar(count_stmt) if with_count else None
+    items, next_cursor = page_result((await session.execute(page_stmt)).all(), limit)
+    return items, next_cursor, total
+
+
+def page_headers(next_cursor, total):
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return headers
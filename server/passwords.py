@@ -0,0 +1,105 @@
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# Password hashing is CPU-bound and deliberately slow, so it runs on a small
+# dedicated pool instead of the request threads. At most workers + queue
+# hashes are admitted at once; beyond that callers get HashingBusy right away
+# rather than piling up behind each other.
+
+
+class HashingBusy(Exception):
+    pass
+
+
+_pool = None
+_slots = None
+_method = "scrypt"
+_timeout = None
+_lock = threading.Lock()
+_in_flight = 0
+_rejected = 0
+
+
+def normalize_method(method):
+    # werkzeug expands bare method names, do the same so stored hashes compare equal
+    if method == "scrypt":
+        return "scrypt:32768:8:1"
+    if method == "pbkdf2":
+        return f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+    if method.startswith("pbkdf2:") and method.count(":") == 1:
+        return f"{method}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+
+def _legacy_check(stored, password):
+    # "sha256$salt$hexdigest" hashes from werkzeug < 2.3 (method='sha256')
+    method, salt, digest = stored.split("$", 2)
+    expected = hmac.new(salt.encode(), password.encode(), method).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def _verify(stored, password):
+    method = stored.split("$", 1)[0]
+    if method in ("sha1", "sha256", "sha512", "md5"):
+        return _legacy_check(stored, password)
+    return check_password_hash(stored, password)
+
+
+def _run(function, *args):
+    global _in_flight, _rejected
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            _rejected += 1
+        raise HashingBusy("Too many password operations in progress")
+    with _lock:
+        _in_flight += 1
+    try:
+        return _pool.submit(function, *args).result(timeout=_timeout)
+    finally:
+        with _lock:
+            _in_flight -= 1
+        _slots.release()
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password, _method)
+
+
+def verify_password(stored, password):
+    """Return (matches, needs_rehash) for a stored hash.
+
+    needs_rehash is set when the hash was made with another method or cost
+    than PASSWORD_HASH_METHOD, so callers can upgrade it after a login.
+    """
+    if not stored or "$" not in stored:
+        return False, False
+    matches = _run(_verify, stored, password)
+    return matches, matches and stored.split("$", 1)[0] != _method
+
+
+def stats():
+    """Operations being hashed or queued, and requests turned away so far."""
+    return {"in_flight": _in_flight, "rejected": _rejected}
+
+
+def init_app(app):
+    global _pool, _slots, _method, _timeout
+    app.config.setdefault("PASSWORD_HASH_METHOD", "scrypt")
+    app.config.setdefault("PASSWORD_HASH_WORKERS", os.cpu_count() or 2)
+    app.config.setdefault("PASSWORD_HASH_QUEUE", 4 * app.config["PASSWORD_HASH_WORKERS"])
+    app.config.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+    app.config.setdefault("PASSWORD_HASH_TIMEOUT", 10)
+
+    _method = normalize_method(app.config["PASSWORD_HASH_METHOD"])
+    _timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+    if _pool is None:
+        workers = app.config["PASSWORD_HASH_WORKERS"]
+        # hashlib releases the GIL while hashing, so threads hash in parallel;
+        # a process pool also isolates the CPU load from the request threads
+        executor = ProcessPoolExecutor if app.config["PASSWORD_HASH_EXECUTOR"] == "process" else ThreadPoolExecutor
+        _pool = executor(max_workers=workers)
+        _slots = threading.BoundedSemaphore(workers + app.config["PASSWORD_HASH_QUEUE"])
@@ -0,0 +1,82 @@
+import re
+from contextlib import contextmanager
+
+from flask import current_app
+from sqlalchemy import event, select
+
+from cache import NullCache
+from config import db
+from models import BugBite, Creature, User
+
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+
+def hot_requests():
+    """(method, path, json) for the endpoint calls that must never scan a table,
+    built from rows that exist in the current database."""
+    user = db.session.scalars(select(User).order_by(User.id).limit(1)).first()
+    bug_bite_id = db.session.scalar(select(BugBite.id).order_by(BugBite.id).limit(1))
+    creature = db.session.scalars(select(Creature).order_by(Creature.id).limit(1)).first()
+    keyword = (creature.bug_description or creature.bug_name).split()[0] if creature else "ant"
+
+    requests = [
+        ("GET", f"/search_creatures?keywords={keyword}&limit=2", None),
+        ("GET", f"/bite_treatments?bite_description={keyword}&limit=2", None),
+    ]
+    if user:
+        requests += [
+            ("GET", f"/get_user/{user.id}", None),
+            ("POST", "/login", {"email": user.email, "password": "not-the-password"}),
+        ]
+    if bug_bite_id:
+        requests.append(("GET", f"/bug_bites/{bug_bite_id}", None))
+    return requests
+
+
+@contextmanager
+def capture_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def full_scans(statement, parameters):
+    """Tables an SQLite query plan reads end to end (plain or covering index scans)."""
+    plan = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    tables = set(db.metadata.tables)
+    scans = []
+    for row in plan:
+        match = SCAN_RE.match(row[-1])
+        if match and match.group(1) in tables:
+            scans.append(row[-1])
+    return scans
+
+
+def check_query_plans():
+    """Run the hot endpoint calls and return [(request, statement, scans)]
+    for every statement whose plan scans a whole table."""
+    app = current_app._get_current_object()
+    # cached responses issue no SQL, so bypass the cache while capturing
+    cache = app.extensions["cache"]
+    app.extensions["cache"] = NullCache()
+    failures = []
+    try:
+        client = app.test_client()
+        for method, path, json in hot_requests():
+            with capture_statements() as statements:
+                client.open(path, method=method, json=json)
+            for statement, parameters in statements:
+                scans = full_scans(statement, parameters)
+                if scans:
+                    failures.append((f"{method} {path}", statement, scans))
+    finally:
+        app.extensions["cache"] = cache
+    return failures
@@ -0,0 +1,86 @@
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+
+import derived
+from models import BiteTreatment, BugBite, Creature, TreatmentRecommendation, biter
+from search import tokenize
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "i", "in", "is", "it", "its", "my", "of", "on", "or", "that", "the", "this",
+    "to", "was", "were", "with",
+}
+
+recommendations = TreatmentRecommendation.__table__
+
+
+def keywords(*texts):
+    return {token for text in texts for token in tokenize(text) if token not in STOPWORDS and len(token) > 1}
+
+
+@derived.register
+class RecommendationIndex:
+    """Keyword -> treatment weights: how many bites mentioning the keyword
+    (in the bite or its creatures) were treated with that plan."""
+
+    @staticmethod
+    def contributions(connection, bite_ids):
+        counts = Counter()
+        for chunk in derived.chunks(bite_ids):
+            bites = connection.execute(
+                select(BugBite.id, BugBite.treatment_plan_id, BugBite.bite_description, BugBite.symptoms)
+                .where(BugBite.id.in_(chunk), BugBite.treatment_plan_id.is_not(None))
+            ).all()
+            if not bites:
+                continue
+            creature_texts = {}
+            for bug_bite_id, bug_name, bug_description in connection.execute(
+                select(biter.c.bug_bite_id, Creature.bug_name, Creature.bug_description)
+                .join(Creature, Creature.id == biter.c.creature_id)
+                .where(biter.c.bug_bite_id.in_([bite.id for bite in bites]))
+            ):
+                creature_texts.setdefault(bug_bite_id, []).extend([bug_name, bug_description])
+            for bite in bites:
+                texts = [bite.bite_description, bite.symptoms] + creature_texts.get(bite.id, [])
+                for keyword in keywords(*texts):
+                    counts[(keyword, bite.treatment_plan_id)] += 1
+        return counts
+
+    @classmethod
+    def apply(cls, connection, bite_ids, sign):
+        counts = cls.contributions(connection, bite_ids)
+        if not counts:
+            return
+        rows = [
+            {"keyword": keyword, "treatment_id": treatment_id, "weight": sign * count}
+            for (keyword, treatment_id), count in counts.items()
+        ]
+        derived.upsert(connection, recommendations, rows, ["keyword", "treatment_id"], "weight")
+        if sign < 0:
+            connection.execute(delete(recommendations).where(recommendations.c.weight <= 0))
+
+    @staticmethod
+    def clear(connection):
+        connection.execute(delete(recommendations))
+
+
+def recommend_treatments_query(bite_description=None, creature_description=None):
+    """Build a select() of treatments ranked for the given bite and creature text.
+
+    Returns (stmt, ordering) like search.search_creatures_query. Without any
+    keywords every treatment is returned in id order.
+    """
+    by_id = [(BiteTreatment.id, False)]
+    terms = keywords(bite_description, creature_description)
+    if not terms:
+        return select(BiteTreatment), by_id
+
+    ranked = (
+        select(recommendations.c.treatment_id, func.sum(recommendations.c.weight).label("score"))
+        .where(recommendations.c.keyword.in_(terms))
+        .group_by(recommendations.c.treatment_id)
+        .subquery()
+    )
+    stmt = select(BiteTreatment).join(ranked, ranked.c.treatment_id == BiteTreatment.id)
+    return stmt, [(ranked.c.score, True)] + by_id
@@ -1,26 +1,40 @@
+import time
+
+from flask import g, has_app_context
 from marshmallow import Schema, fields, validate
 
 
-class UserSchema(Schema):
+class BaseSchema(Schema):
+    # dump time is added up per request (per app context) and reported on /metrics
+    def dump(self, obj, *, many=None):
+        started = time.perf_counter()
+        try:
+            return super().dump(obj, many=many)
+        finally:
+            if has_app_context():
+                g.serialize_time = g.get("serialize_time", 0.0) + time.perf_counter() - started
+
+
+class UserSchema(BaseSchema):
     id = fields.Integer(dump_only=True)
     username = fields.String(required=True, validate=validate.Length(min=1))
     email = fields.String(required=True)
     password = fields.String(required=True, validate=validate.Length(min=8))
 
-class CreatureSchema(Schema):
+class CreatureSchema(BaseSchema):
     id = fields.Integer(dump_only=True)
     bug_name = fields.String(required=True)
     image = fields.String()
     bug_description = fields.String(required=True)
 
 
-class BiteTreatmentSchema(Schema):
+class BiteTreatmentSchema(BaseSchema):
     id = fields.Integer(dump_only=True)
     treatment_plan = fields.String()
 
 
 
-class BugBiteSchema(Schema):
+class BugBiteSchema(BaseSchema):
     id = fields.Integer(dump_only=True)
     bite_description = fields.String(required=True, validate=validate.Length(min=10))
     symptoms = fields.String()
@@ -0,0 +1,70 @@
+import re
+
+from sqlalchemy import and_, false, inspect, literal_column, or_, select, table, column
+
+from config import db
+from models import Creature
+
+# FTS5 index over creatures.bug_description, created and kept in sync by the
+# 3f9a1c7d2b64 migration (insert/update/delete triggers on creatures)
+FTS_TABLE = "creatures_fts"
+creatures_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_fts_available = {}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def fts_available():
+    # only SQLite gets the FTS5 table, cache the lookup per engine url
+    engine = db.engine
+    key = str(engine.url)
+    if key not in _fts_available:
+        _fts_available[key] = (
+            engine.dialect.name == "sqlite" and inspect(engine).has_table(FTS_TABLE)
+        )
+    return _fts_available[key]
+
+
+def build_match_expression(keywords, match_all=False, prefix=True):
+    # every keyword becomes a quoted phrase so user input can't inject FTS syntax
+    terms = []
+    for keyword in keywords:
+        tokens = tokenize(keyword)
+        if not tokens:
+            continue
+        phrase = '"' + " ".join(tokens) + '"'
+        terms.append(phrase + "*" if prefix else phrase)
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+def search_creatures_query(keywords, match_all=False, prefix=True):
+    """Build a select() of creatures matching the keywords.
+
+    Returns (stmt, ordering) where ordering is the list of (column, descending)
+    pairs giving best match first, ready for pagination.paginate().
+    """
+    by_id = [(Creature.id, False)]
+    keywords = [keyword for keyword in keywords if keyword.strip()]
+    if not keywords:
+        return select(Creature), by_id
+
+    if fts_available():
+        expression = build_match_expression(keywords, match_all, prefix)
+        if not expression:
+            return select(Creature).where(false()), by_id
+        stmt = (
+            select(Creature)
+            .join(creatures_fts, creatures_fts.c.rowid == Creature.id)
+            .where(literal_column(FTS_TABLE).op("MATCH")(expression))
+        )
+        return stmt, [(creatures_fts.c.rank, False)] + by_id
+
+    # no FTS index (e.g. PostgreSQL or a create_all() database): substring scan
+    conditions = [Creature.bug_description.ilike(f"%{keyword.strip()}%") for keyword in keywords]
+    combine = and_ if match_all else or_
+    return select(Creature).where(combine(*conditions)), by_id
@@ -1,57 +1,128 @@
 #!/usr/bin/env python3
 
 # Standard library imports
-from random import choice as rc
+import argparse
+import time
+from random import choice as rc, randint, sample
 
 # Remote library imports
 from faker import Faker
+from sqlalchemy import func, select
 
 # Local imports
-from app import app
+from app import create_app
+import derived
+from bulk import bulk_insert, bulk_link_creatures, chunked
 from models import db
 from models import User, Creature, BugBite, BiteTreatment
+from passwords import hash_password
 
-if __name__ == '__main__':
+TREATMENT_PLANS = [
+    "Wash with warm water and mild soap",
+    "Apply antispetic cream",
+    "Consult a doctor if symptoms persist",
+    "Elevate the affected area",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the WhoBitMe database")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--creatures", type=int, default=5)
+    parser.add_argument("--treatments", type=int, default=25)
+    parser.add_argument("--bites", type=int, default=5)
+    parser.add_argument("--max-creatures-per-bite", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--password", default="password123", help="Password shared by every seeded user")
+    return parser.parse_args()
+
+
+def next_id(model):
+    # rows get explicit ids so bites can be linked without reading them back
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def text_pool(factory, size=1000):
+    # faker is the slow part of seeding, so rows draw from a pool of texts
+    return [factory() for _ in range(size)]
+
+
+def generate_users(fake, count, password):
+    password_hash = hash_password(password)
+    start = next_id(User)
+    for user_id in range(start, start + count):
+        username = f"{fake.user_name()}{user_id}"
+        yield {"id": user_id, "username": username, "email": f"{username}@example.com", "password": password_hash}
+
+
+def generate_creatures(fake, count):
+    descriptions = text_pool(fake.sentence)
+    images = text_pool(fake.image_url)
+    for _ in range(count):
+        yield {
+            "bug_name": rc(["Ant", "Spider", "Bee", "Tick"]),
+            "image": rc(images),
+            "bug_description": rc(descriptions),
+        }
+
+
+def generate_treatments(count):
+    for _ in range(count):
+        yield {"treatment_plan": rc(TREATMENT_PLANS)}
+
+
+def generate_bites(fake, count, user_ids, treatment_ids, creature_ids, max_creatures, links):
+    descriptions = text_pool(lambda: fake.sentence(nb_words=6))
+    symptoms = text_pool(fake.paragraph)
+    start = next_id(BugBite)
+    for bug_bite_id in range(start, start + count):
+        if creature_ids:
+            for creature_id in sample(creature_ids, randint(1, min(max_creatures, len(creature_ids)))):
+                links.append({"creature_id": creature_id, "bug_bite_id": bug_bite_id})
+        yield {
+            "id": bug_bite_id,
+            "bite_description": rc(descriptions),
+            "symptoms": rc(symptoms),
+            "severity_of_bite": rc(["Mild", "Moderate", "Severe"]),
+            "user_id": rc(user_ids) if user_ids else None,
+            "treatment_plan_id": rc(treatment_ids) if treatment_ids else None,
+        }
+
+
+def seed(users=5, creatures=5, treatments=25, bites=5, max_creatures_per_bite=2,
+         batch_size=5000, password="password123"):
     fake = Faker()
+    started = time.perf_counter()
+    total = 0
+
+    total += bulk_insert(User, generate_users(fake, users, password), batch_size)
+    total += bulk_insert(Creature, generate_creatures(fake, creatures), batch_size)
+    total += bulk_insert(BiteTreatment, generate_treatments(treatments), batch_size)
+
+    user_ids = db.session.scalars(select(User.id)).all()
+    creature_ids = db.session.scalars(select(Creature.id)).all()
+    treatment_ids = db.session.scalars(select(BiteTreatment.id)).all()
+
+    # links are collected per batch of bites and inserted right after them
+    links = []
+    generated = generate_bites(fake, bites, user_ids, treatment_ids, creature_ids,
+                               max_creatures_per_bite, links)
+    for chunk in chunked(generated, batch_size):
+        total += bulk_insert(BugBite, chunk, batch_size)
+        total += bulk_link_creatures(links, batch_size)
+        links.clear()
+        # bulk inserts skip the flush hooks that maintain the derived tables
+        derived.refresh(db.session.connection(), [bite["id"] for bite in chunk])
+        db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    app = create_app()
     with app.app_context():
         print("Starting seed...")
-        # Seed code goes here!
-        
-        for _ in range(5): 
-            user = User(username=fake.user_name(), email=fake.email(), password=fake.password())
-            db.session.add(user)
-            db.session.commit()
-
-        for _ in range(5):
-            creature = Creature(
-                bug_name=rc(["Ant", "Spider", "Bee", "Tick"]),
-                image=fake.image_url(),
-                bug_description=fake.sentence(),
-            )
-            print(f"Inserting Creature: {creature}")
-            db.session.add(creature)
-            db.session.commit()
-
-        for _ in range(5):
-            bug_bite = BugBite(
-                bite_description=fake.sentence(),
-                symptoms=fake.paragraph(),
-                severity_of_bite=rc(["Mild", "Moderate", "Severe"]),
-            )
-            db.session.add(bug_bite)
-            db.session.commit()
-
-            for _ in range(5):
-                bite_treatment = BiteTreatment(
-                treatment_plan=rc([
-            "Wash with warm water and mild soap",
-            "Apply antispetic cream",
-            "Consult a doctor if symptoms persist",
-            "Elevate the affected area"]),
-            )
-            db.session.add(bite_treatment)
-
-            db.session.commit()
-
-            print("Database seeded")
-
+        seed(**vars(args))
+        print("Database seeded")
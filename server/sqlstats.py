@@ -0,0 +1,73 @@
+import logging
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_listening = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_app_context():
+        return
+    started = getattr(context, "_query_started", None)
+    g.sql_count = g.get("sql_count", 0) + 1
+    if started is not None:
+        g.sql_time = g.get("sql_time", 0.0) + time.perf_counter() - started
+
+
+def sql_stats():
+    """(statement count, seconds spent in SQL) for the current request."""
+    return g.get("sql_count", 0), g.get("sql_time", 0.0)
+
+
+def query_budget(budget):
+    """Override SQL_QUERY_BUDGET for a single view."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.sql_budget = budget
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _check_budget(response):
+    budget = g.get("sql_budget", current_app.config.get("SQL_QUERY_BUDGET"))
+    if not budget:
+        return response
+
+    count, elapsed = sql_stats()
+    response.headers["X-SQL-Queries"] = str(count)
+    if count <= budget:
+        return response
+
+    message = f"{request.method} {request.path} issued {count} SQL statements (budget {budget})"
+    logger.warning(message)
+    if current_app.config.get("SQL_QUERY_BUDGET_STRICT"):
+        response = jsonify({"message": f"Query budget exceeded: {message}"})
+        response.status_code = 500
+    return response
+
+
+def init_app(app):
+    """Count SQL statements per request and enforce SQL_QUERY_BUDGET.
+
+    With SQL_QUERY_BUDGET set, requests over the budget are logged, or turned
+    into a 500 when SQL_QUERY_BUDGET_STRICT is on (meant for tests and debug).
+    """
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listening = True
+    app.after_request(_check_budget)
@@ -0,0 +1,317 @@
+# Remote library imports
+import click
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_login import login_user, login_required, logout_user, current_user
+from flask_restful import Resource, Api, reqparse
+from marshmallow.exceptions import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+# Local imports
+from config import db, login_manager
+from models import User, Creature, BugBite, BiteTreatment
+from schemas import UserSchema, CreatureSchema, BugBiteSchema, BiteTreatmentSchema
+from search import search_creatures_query
+from bulk import MAX_BULK_ROWS, bulk_insert, bulk_link_creatures
+from export import EXPORT_FORMATS, EXPORT_MIMETYPES, export_bug_bites
+from cache import cached, invalidate_models
+from queryplans import check_query_plans
+from recommendations import recommend_treatments_query
+import derived
+from passwords import HashingBusy, hash_password, verify_password
+from pagination import PaginationError, paginate, parse_count, parse_fields, parse_limit, page_headers
+
+# cli_group=None keeps commands at the top level, e.g. `flask export-bites`
+bp = Blueprint('views', __name__, cli_group=None)
+api = Api(bp)
+
+@login_manager.user_loader
+def load_user(user_id):
+    return db.session.get(User, int(user_id))
+
+
+# Views go here!
+@bp.route('/')
+def index():
+    return '<h1>Welcome to the WhoBitMe App<h1>' 
+
+#Get/search for current user
+@bp.route('/get_user/<int:user_id>', methods=['GET'])
+@cached('get_user', depends_on=[User])
+def get_user(user_id):
+    user = db.session.get(User, user_id)
+
+    if user:
+        user_schema = UserSchema()
+        user_json = user_schema.dump(user)
+
+        return jsonify(user_json), 200
+    else: 
+        return jsonify({"message": "User not found"}), 404
+  #Create new user  
+@bp.route('/create_user', methods=['POST'])
+def create_user():
+    data = request.get_json()
+    user_schema = UserSchema()
+
+    try:
+        already_user = User.query.filter(func.lower(User.email) == data['email'].lower()).first()
+        if already_user:
+            return jsonify({"message": "User already exists"}), 400   
+
+        new_user = User(
+            username=data['username'],
+            email=data['email'],
+            password=hash_password(data['password'])
+        )
+
+        db.session.add(new_user)
+        db.session.commit() 
+
+        result = user_schema.dump(new_user)
+        return jsonify({"message": "User created successfully", "user": result}) 
+    except HashingBusy as e:
+        return jsonify({"message": str(e)}), 503, {"Retry-After": "1"}
+    except Exception as e:
+        return jsonify({"message": str(e)})
+ 
+
+#User login
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.get_json()
+    user = User.query.filter(func.lower(User.email) == data['email'].lower()).first()
+
+    try:
+        matches, needs_rehash = verify_password(user.password, data['password']) if user else (False, False)
+        if needs_rehash:
+            # upgrade hashes made with an older method or cost
+            user.password = hash_password(data['password'])
+            db.session.commit()
+    except HashingBusy as e:
+        return jsonify({"message": str(e)}), 503, {"Retry-After": "1"}
+
+    if matches:
+        login_user(user)
+        return jsonify({"message": "Login successful"})
+    else:
+        return jsonify({"message": "Invalid"})
+ 
+ # logout user   
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return jsonify({"message": "Logout successful"})
+
+#get current user
+@bp.route('/current_user')
+@login_required
+def get_current_user():
+    user_schema = UserSchema()
+    user_json = user_schema.dump(current_user)
+    return jsonify(user_json), 200
+
+# request treatment plan based on keywords received
+@bp.route('/search_creatures', methods=['GET'])
+@cached('search_creatures', depends_on=[Creature])
+def search_creatures():
+    keywords = request.args.get('keywords', '').split(',')
+    match_all = request.args.get('match', 'any') == 'all'
+    prefix = request.args.get('prefix', 'true').lower() != 'false'
+    query, ordering = search_creatures_query(keywords, match_all=match_all, prefix=prefix)
+
+    try:
+        fields = parse_fields(request.args, CreatureSchema)
+        creatures, next_cursor, total = paginate(
+            query, ordering, model=Creature, fields=fields,
+            limit=parse_limit(request.args), after=request.args.get('after'),
+            with_count=parse_count(request.args))
+    except PaginationError as err:
+        return jsonify({"message": str(err)}), 400
+
+    creature_schema = CreatureSchema(many=True, only=fields)
+    creatures_data = creature_schema.dump(creatures)
+
+    return jsonify({"creatures": creatures_data}), 200, page_headers(next_cursor, total)
+
+# Use restful CRUD for bug bite
+# BugBiteSchema dumps the creatures, load them with the bite in one extra query
+BUG_BITE_LOAD_OPTIONS = [selectinload(BugBite.creatures)]
+
+class BugBiteResource(Resource):
+    method_decorators = {'get': [cached('bug_bites', depends_on=[BugBite, Creature])]}
+
+    def __init__(self):
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('bite_description', type=str, required=True, help='Bite description')
+        self.parser.add_argument('symptoms', type=str, help='Symptoms of the bite')
+        self.parser.add_argument('severity_of_bite', type=str, help='Severity of the bite')
+        self.parser.add_argument('treatment_plan_id', type=int, required=True, help='Treatment plan ID')
+
+    def get(self, bug_bite_id):
+        bug_bite = db.session.get(BugBite, bug_bite_id, options=BUG_BITE_LOAD_OPTIONS)
+
+        if bug_bite:
+            bug_bite_schema = BugBiteSchema()
+            result = bug_bite_schema.dump(bug_bite)
+            return result, 200
+        else:
+            return {"message": "BugBite not found"}, 404
+        
+    def put(self,bug_bite_id):
+        bug_bite = db.session.get(BugBite, bug_bite_id, options=BUG_BITE_LOAD_OPTIONS)
+
+        if bug_bite:
+            data = {key: value for key, value in self.parser.parse_args().items() if value is not None}
+            bug_bite_schema = BugBiteSchema()
+
+            try:
+                changes = bug_bite_schema.load(data, partial=True)
+            except ValidationError as err:
+                return err.messages, 400
+
+            for key, value in changes.items():
+                setattr(bug_bite, key, value)
+            db.session.commit()
+            result = bug_bite_schema.dump(bug_bite)
+            return {"message": "BugBite updated successfully", "bug_bite": result}, 200
+        else:
+            return {"message": "BugBite not found"}, 404
+        
+    def post(self):
+        data = {key: value for key, value in self.parser.parse_args().items() if value is not None}
+        bug_bite_schema = BugBiteSchema()
+
+        try:
+            new_bug_bite = BugBite(**bug_bite_schema.load(data))
+        except ValidationError as err:
+            return err.messages, 400
+        db.session.add(new_bug_bite)
+        db.session.commit()
+        result = bug_bite_schema.dump(new_bug_bite)
+        return {"message": "BugBite created successfully", "bug_bite": result}, 201
+        
+    def delete(self, bug_bite_id):
+        bug_bite = db.session.get(BugBite, bug_bite_id)
+
+        if bug_bite:
+            db.session.delete(bug_bite)
+            db.session.commit()
+            return {"message": "BugBite deleted successfully"}, 200
+        else:
+            return {"message": "BugBite not found"}, 404
+        
+api.add_resource(BugBiteResource, '/bug_bites/<int:bug_bite_id>')
+
+# bulk create bug bites, creatures are given as creature ids
+@bp.route('/bug_bites/bulk', methods=['POST'])
+def bulk_create_bug_bites():
+    data = request.get_json()
+    if not isinstance(data, list) or len(data) > MAX_BULK_ROWS:
+        return jsonify({"message": f"Expected a list of at most {MAX_BULK_ROWS} bug bites"}), 400
+
+    try:
+        bug_bites = BugBiteSchema(many=True).load(data)
+        creature_ids = [[int(creature_id) for creature_id in bite.pop('creatures', [])] for bite in bug_bites]
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except ValueError:
+        return jsonify({"message": "creatures must be creature ids"}), 400
+
+    ids = []
+    try:
+        ids = bulk_insert(BugBite, bug_bites, return_ids=True)
+        links = [
+            {"creature_id": creature_id, "bug_bite_id": bug_bite_id}
+            for bug_bite_id, creatures in zip(ids, creature_ids)
+            for creature_id in creatures
+        ]
+        bulk_link_creatures(links)
+    except IntegrityError as err:
+        db.session.rollback()
+        return jsonify({"message": str(err.orig)}), 400
+    finally:
+        # bulk inserts skip the ORM events that maintain derived tables and the cache
+        derived.refresh(db.session.connection(), ids)
+        db.session.commit()
+        invalidate_models(BugBite)
+
+    return jsonify({"message": "BugBites created successfully", "ids": ids}), 201
+
+# bulk create creatures
+@bp.route('/creatures/bulk', methods=['POST'])
+def bulk_create_creatures():
+    data = request.get_json()
+    if not isinstance(data, list) or len(data) > MAX_BULK_ROWS:
+        return jsonify({"message": f"Expected a list of at most {MAX_BULK_ROWS} creatures"}), 400
+
+    try:
+        creatures = CreatureSchema(many=True).load(data)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    ids = bulk_insert(Creature, creatures, return_ids=True)
+    invalidate_models(Creature)
+    return jsonify({"message": "Creatures created successfully", "ids": ids}), 201
+
+#get bite treatment based on input of bite and creature
+@bp.route('/bite_treatments', methods=['GET'])
+@cached('bite_treatments', depends_on=[BiteTreatment, BugBite, Creature])
+def get_bite_treatments_by_descriptions():
+    bite_description = request.args.get('bite_description')
+    creature_description = request.args.get('creature_description')
+    # ranked by how often each plan treated bites sharing these keywords
+    query, ordering = recommend_treatments_query(bite_description, creature_description)
+
+    try:
+        fields = parse_fields(request.args, BiteTreatmentSchema)
+        bite_treatments, next_cursor, total = paginate(
+            query, ordering, model=BiteTreatment, fields=fields,
+            limit=parse_limit(request.args), after=request.args.get('after'),
+            with_count=parse_count(request.args))
+    except PaginationError as err:
+        return jsonify({"message": str(err)}), 400
+
+    bite_treatment_schema = BiteTreatmentSchema(many=True, only=fields)
+    result = bite_treatment_schema.dump(bite_treatments)
+    return jsonify(result), 200, page_headers(next_cursor, total)
+
+# stream every bug bite with its creatures and treatment plan
+@bp.route('/bug_bites/export', methods=['GET'])
+def export_bug_bites_view():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": f"Unknown export format: {export_format}"}), 400
+
+    chunks = export_bug_bites(export_format)
+    return Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[export_format])
+
+@bp.cli.command('export-bites')
+@click.option('--format', 'export_format', type=click.Choice(EXPORT_FORMATS), default='ndjson')
+@click.option('--output', type=click.File('w'), default='-', help='File to write, stdout by default')
+@click.option('--batch-size', type=int, default=1000)
+def export_bites_command(export_format, output, batch_size):
+    """Export all bug bites as NDJSON or CSV."""
+    for chunk in export_bug_bites(export_format, batch_size):
+        output.write(chunk)
+
+@bp.cli.command('rebuild-derived')
+def rebuild_derived_command():
+    """Recompute the tables derived from bug bites (treatment recommendations)."""
+    derived.rebuild(db.session.connection())
+    db.session.commit()
+
+@bp.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Fail if a hot endpoint query plan scans a whole table (SQLite only)."""
+    if db.engine.dialect.name != 'sqlite':
+        raise click.ClickException('EXPLAIN QUERY PLAN checks need an SQLite database')
+
+    failures = check_query_plans()
+    for request_line, statement, scans in failures:
+        click.echo(f"{request_line}\n  {' '.join(statement.split())}\n  -> {'; '.join(scans)}", err=True)
+    if failures:
+        raise click.ClickException(f"{len(failures)} statements scan a whole table")
+    click.echo('No full table scans in the hot endpoint queries')